@@ -8,7 +8,7 @@ from typing import TYPE_CHECKING, Annotated, Any
 
 import aiofiles
 from fastapi import APIRouter, Depends, Header, HTTPException, Query, Request, Response, status
-from sqlalchemy import select
+from sqlalchemy import select, update
 from sqlalchemy.engine.result import Result
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.sql.selectable import Select
@@ -29,6 +29,7 @@ from backend.app.utils import (
 
 if TYPE_CHECKING:
     from sqlalchemy.engine.result import Result
+    from sqlalchemy.sql.dml import Update
     from sqlalchemy.sql.selectable import Select
 
 router = APIRouter(prefix="/api/uploads", tags=["uploads"])
@@ -297,6 +298,18 @@ async def initiate_upload(
             detail="File type not allowed for this token",
         )
 
+    # Claim the slot in SQL; the WHERE clause matches no row once the token is full.
+    stmt: Update = (
+        update(models.UploadToken)
+        .where(models.UploadToken.id == token_row.id)
+        .where(models.UploadToken.uploads_used < models.UploadToken.max_uploads)
+        .values(uploads_used=models.UploadToken.uploads_used + 1)
+    )
+    res: Result[Any] = await db.execute(stmt)
+    if not res.rowcount:
+        await db.rollback()
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Upload limit reached")
+
     ext: str | None = None
     if payload.filename:
         ext: str = Path(payload.filename).suffix.lstrip(".")
@@ -321,7 +334,6 @@ async def initiate_upload(
     filename_on_disk: str = f"{record.id}.{ext}" if ext else str(record.id)
     storage_path: Path = storage_dir / filename_on_disk
     record.storage_path = str(storage_path)
-    token_row.uploads_used += 1
 
     await db.commit()
     await db.refresh(record)
@@ -580,7 +592,8 @@ async def cancel_upload(
 
     await db.delete(record)
 
-    token_row.uploads_used -= 1
+    # Decrement in SQL so concurrent cancels on the same token do not lose updates.
+    token_row.uploads_used = models.UploadToken.uploads_used - 1
 
     await db.commit()
     await db.refresh(token_row)
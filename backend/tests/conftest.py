@@ -67,19 +67,20 @@ def test_run_dir():
 
 
 @pytest.fixture(autouse=True)
-async def reset_database():
-    """Clean database before and after each test by dropping and recreating all tables."""
+async def reset_database(setup_db):
+    """
+    Clean the in-memory database before each test by deleting all rows.
+
+    create_all only emits DDL when the tables are missing. That happens after a test leaves a
+    post-processing worker mid-query: stopping the queue cancels it, SQLAlchemy invalidates the
+    single StaticPool connection on the CancelledError, and the in-memory database goes with it.
+    """
     from backend.app.db import Base, engine
 
     async with engine.begin() as conn:
-        await conn.run_sync(Base.metadata.drop_all)
-        await conn.run_sync(Base.metadata.create_all)
-
-    yield
-
-    async with engine.begin() as conn:
-        await conn.run_sync(Base.metadata.drop_all)
         await conn.run_sync(Base.metadata.create_all)
+        for table in reversed(Base.metadata.sorted_tables):
+            await conn.execute(table.delete())
 
 
 @pytest.fixture(autouse=True)
@@ -104,6 +105,16 @@ async def setup_db(test_run_dir):
     await engine.dispose()
 
 
+@pytest.fixture(scope="session", autouse=True)
+async def warmup_app(setup_db):
+    """Send one request through the app so the first test does not pay for route, model and mapper setup."""
+    from backend.app.main import app
+
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://testserver") as client:
+        await client.get(app.url_path_for("get_token", token_value="nonexistent"))  # noqa: S106
+
+
 @pytest.fixture(scope="session", autouse=True)
 def setup_frontend(test_run_dir):
     """Create minimal frontend structure for tests."""
@@ -115,6 +126,24 @@ def setup_frontend(test_run_dir):
     fallback_image.write_bytes(TEST_FALLBACK_THUMBNAIL_BYTES)
 
 
+@pytest.fixture
+def seeded_schema(reset_metadata_schema):
+    """Seed the default metadata schema for a test."""
+    return seed_schema()
+
+
+@pytest.fixture
+async def upload_token(reset_database):
+    """
+    Insert a single-use token directly into the database.
+
+    For tests that only need a valid token, this skips the admin token endpoint round trip.
+    """
+    from backend.tests.utils import create_token_direct
+
+    return await create_token_direct(max_uploads=1, max_size_bytes=1000)
+
+
 @pytest.fixture
 async def processing_queue():
     """Create a fresh processing queue for each test."""
@@ -90,8 +90,9 @@ async def test_proxy_headers_preserve_forwarded_port():
         )
 
     assert response.status_code == 200
-    assert response.json()["base_url"] == "https://files.example.com:8443/"
-    assert response.json()["host"] == "files.example.com:8443"
+    data = response.json()
+    assert data["base_url"] == "https://files.example.com:8443/"
+    assert data["host"] == "files.example.com:8443"
 
 
 def test_server_entrypoint_disables_uvicorn_proxy_headers_by_default(monkeypatch):
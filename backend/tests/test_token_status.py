@@ -6,8 +6,7 @@ from httpx import ASGITransport, AsyncClient
 from fastapi import status
 
 from backend.app.main import app
-from backend.app.config import settings
-from backend.tests.utils import create_token
+from backend.tests.utils import ADMIN_HEADERS, create_token
 
 
 @pytest.mark.asyncio
@@ -23,7 +22,7 @@ async def test_disabled_token_can_be_viewed_but_not_used():
         await client.patch(
             app.url_path_for("update_token", token_value=upload_token),
             json={"disabled": True},
-            headers={"Authorization": f"Bearer {settings.admin_api_key}"},
+            headers=ADMIN_HEADERS,
         )
 
         # get_token should still work and return the token info
@@ -64,10 +63,7 @@ async def test_expired_token_can_be_viewed_but_not_used():
         assert data["token"] == upload_token, "Should return token info"
 
         # Verify it's expired by checking the timestamp
-        expires_at_str = data["expires_at"]
-        if expires_at_str.endswith("Z"):
-            expires_at_str = expires_at_str[:-1] + "+00:00"
-        expires_at = datetime.fromisoformat(expires_at_str)
+        expires_at = datetime.fromisoformat(data["expires_at"].replace("Z", "+00:00"))
         if expires_at.tzinfo is None:
             expires_at = expires_at.replace(tzinfo=UTC)
         now = datetime.now(UTC)
@@ -101,7 +97,7 @@ async def test_download_token_view_works_for_disabled():
         await client.patch(
             app.url_path_for("update_token", token_value=upload_token),
             json={"disabled": True},
-            headers={"Authorization": f"Bearer {settings.admin_api_key}"},
+            headers=ADMIN_HEADERS,
         )
 
         # Access with download token should still work
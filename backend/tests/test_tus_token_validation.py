@@ -7,20 +7,20 @@ from fastapi import status
 from httpx import ASGITransport, AsyncClient
 
 from backend.app.main import app
-from backend.tests.utils import create_token, initiate_upload, tus_head
+from backend.tests.utils import ADMIN_HEADERS, create_token_direct, initiate_upload, tus_head
 
 
 @pytest.mark.asyncio
 async def test_tus_head_blocked_for_expired_token():
     """TUS HEAD should fail when token is expired."""
-    from backend.app.db import get_db
+    from backend.app.db import SessionLocal
     from backend.app.models import UploadToken
-    from sqlalchemy import select, update
+    from sqlalchemy import update
 
     transport = ASGITransport(app=app)
     async with AsyncClient(transport=transport, base_url="http://testserver") as client:
         # Create valid token and initiate upload
-        token_data = await create_token(client)
+        token_data = await create_token_direct()
         token_value = token_data["token"]
 
         upload_data = await initiate_upload(
@@ -33,15 +33,14 @@ async def test_tus_head_blocked_for_expired_token():
         upload_id = upload_data["upload_id"]
 
         # Manually expire the token in database
-        async for db in get_db():
+        async with SessionLocal() as db:
             expired_time = datetime.now(UTC) - timedelta(hours=1)
             stmt = update(UploadToken).where(UploadToken.token == token_value).values(expires_at=expired_time)
             await db.execute(stmt)
             await db.commit()
-            break
 
         # TUS HEAD should fail for expired token
-        status_code, headers = await tus_head(client, upload_id)
+        status_code, _ = await tus_head(client, upload_id)
         assert status_code == status.HTTP_403_FORBIDDEN, "HEAD should fail with expired token"
 
 
@@ -51,7 +50,7 @@ async def test_tus_head_blocked_for_disabled_token():
     transport = ASGITransport(app=app)
     async with AsyncClient(transport=transport, base_url="http://testserver") as client:
         # Create token
-        token_data = await create_token(client)
+        token_data = await create_token_direct()
         token_value = token_data["token"]
 
         # Initiate upload
@@ -65,30 +64,29 @@ async def test_tus_head_blocked_for_disabled_token():
         upload_id = upload_data["upload_id"]
 
         # Disable the token
-        admin_key = "test-admin"
         disable_response = await client.patch(
             f"/api/tokens/{token_value}",
             json={"disabled": True},
-            headers={"Authorization": f"Bearer {admin_key}"},
+            headers=ADMIN_HEADERS,
         )
         assert disable_response.status_code == status.HTTP_200_OK, "Token should be disabled successfully"
 
         # TUS HEAD should now fail
-        status_code, headers = await tus_head(client, upload_id)
+        status_code, _ = await tus_head(client, upload_id)
         assert status_code == status.HTTP_403_FORBIDDEN, "HEAD should fail with disabled token"
 
 
 @pytest.mark.asyncio
 async def test_tus_patch_blocked_for_expired_token():
     """TUS PATCH should fail when token is expired."""
-    from backend.app.db import get_db
+    from backend.app.db import SessionLocal
     from backend.app.models import UploadToken
-    from sqlalchemy import select, update
+    from sqlalchemy import update
 
     transport = ASGITransport(app=app)
     async with AsyncClient(transport=transport, base_url="http://testserver") as client:
         # Create valid token and initiate upload
-        token_data = await create_token(client)
+        token_data = await create_token_direct()
         token_value = token_data["token"]
 
         upload_data = await initiate_upload(
@@ -101,12 +99,11 @@ async def test_tus_patch_blocked_for_expired_token():
         upload_id = upload_data["upload_id"]
 
         # Manually expire the token in database
-        async for db in get_db():
+        async with SessionLocal() as db:
             expired_time = datetime.now(UTC) - timedelta(hours=1)
             stmt = update(UploadToken).where(UploadToken.token == token_value).values(expires_at=expired_time)
             await db.execute(stmt)
             await db.commit()
-            break
 
         # Try to upload data via PATCH
         patch_response = await client.patch(
@@ -127,7 +124,7 @@ async def test_tus_patch_blocked_for_disabled_token():
     transport = ASGITransport(app=app)
     async with AsyncClient(transport=transport, base_url="http://testserver") as client:
         # Create token
-        token_data = await create_token(client)
+        token_data = await create_token_direct()
         token_value = token_data["token"]
 
         # Initiate upload
@@ -141,11 +138,10 @@ async def test_tus_patch_blocked_for_disabled_token():
         upload_id = upload_data["upload_id"]
 
         # Disable the token
-        admin_key = "test-admin"
         disable_response = await client.patch(
             f"/api/tokens/{token_value}",
             json={"disabled": True},
-            headers={"Authorization": f"Bearer {admin_key}"},
+            headers=ADMIN_HEADERS,
         )
         assert disable_response.status_code == status.HTTP_200_OK, "Token should be disabled successfully"
 
@@ -165,14 +161,14 @@ async def test_tus_patch_blocked_for_disabled_token():
 @pytest.mark.asyncio
 async def test_tus_delete_blocked_for_expired_token():
     """TUS DELETE should fail when token is expired."""
-    from backend.app.db import get_db
+    from backend.app.db import SessionLocal
     from backend.app.models import UploadToken
-    from sqlalchemy import select, update
+    from sqlalchemy import update
 
     transport = ASGITransport(app=app)
     async with AsyncClient(transport=transport, base_url="http://testserver") as client:
         # Create valid token and initiate upload
-        token_data = await create_token(client)
+        token_data = await create_token_direct()
         token_value = token_data["token"]
 
         upload_data = await initiate_upload(
@@ -185,12 +181,11 @@ async def test_tus_delete_blocked_for_expired_token():
         upload_id = upload_data["upload_id"]
 
         # Manually expire the token in database
-        async for db in get_db():
+        async with SessionLocal() as db:
             expired_time = datetime.now(UTC) - timedelta(hours=1)
             stmt = update(UploadToken).where(UploadToken.token == token_value).values(expires_at=expired_time)
             await db.execute(stmt)
             await db.commit()
-            break
 
         # Try to delete via TUS DELETE
         delete_response = await client.delete(f"/api/uploads/{upload_id}/tus")
@@ -203,7 +198,7 @@ async def test_tus_delete_blocked_for_disabled_token():
     transport = ASGITransport(app=app)
     async with AsyncClient(transport=transport, base_url="http://testserver") as client:
         # Create token
-        token_data = await create_token(client)
+        token_data = await create_token_direct()
         token_value = token_data["token"]
 
         # Initiate upload
@@ -217,11 +212,10 @@ async def test_tus_delete_blocked_for_disabled_token():
         upload_id = upload_data["upload_id"]
 
         # Disable the token
-        admin_key = "test-admin"
         disable_response = await client.patch(
             f"/api/tokens/{token_value}",
             json={"disabled": True},
-            headers={"Authorization": f"Bearer {admin_key}"},
+            headers=ADMIN_HEADERS,
         )
         assert disable_response.status_code == status.HTTP_200_OK, "Token should be disabled successfully"
 
@@ -236,7 +230,7 @@ async def test_tus_delete_works_with_valid_token():
     transport = ASGITransport(app=app)
     async with AsyncClient(transport=transport, base_url="http://testserver") as client:
         # Create token
-        token_data = await create_token(client)
+        token_data = await create_token_direct()
         token_value = token_data["token"]
 
         # Initiate upload
@@ -254,5 +248,5 @@ async def test_tus_delete_works_with_valid_token():
         assert delete_response.status_code == status.HTTP_204_NO_CONTENT, "DELETE should work with valid token"
 
         # Verify upload is gone
-        status_code, headers = await tus_head(client, upload_id)
+        status_code, _ = await tus_head(client, upload_id)
         assert status_code == status.HTTP_404_NOT_FOUND, "Upload should be deleted"
@@ -1,244 +1,180 @@
 """Tests for upload cancellation endpoint."""
 
+import asyncio
+import json
+from datetime import UTC, datetime
+
 import pytest
 from fastapi import status
-from httpx import ASGITransport, AsyncClient
+from sqlalchemy import update
 
-from backend.app.config import settings
+from backend.app import models
+from backend.app.db import SessionLocal
 from backend.app.main import app
-from backend.tests.conftest import seed_schema
-from backend.tests.utils import complete_upload, create_token, get_token_info
+from backend.tests.utils import DEFAULT_META, INITIATE_UPLOAD_URL, create_token, raw_request, upload_payload
+
+pytestmark = pytest.mark.usefixtures("seeded_schema")
 
 
 @pytest.mark.asyncio
-async def test_cancel_upload_restores_slot():
+async def test_cancel_upload_restores_slot(client):
     """Test that canceling an upload restores the upload slot."""
-    seed_schema()
-    transport = ASGITransport(app=app)
-    async with AsyncClient(transport=transport, base_url="http://testserver") as client:
-        token_data = await create_token(client, max_uploads=2, max_size_bytes=1000)
-        token = token_data["token"]
-
-        response = await client.post(
-            app.url_path_for("initiate_upload"),
-            params={"token": token},
-            json={
-                "filename": "test1.txt",
-                "filetype": "text/plain",
-                "size_bytes": 100,
-                "meta_data": {"broadcast_date": "2024-01-01", "title": "Test", "source": "youtube"},
-            },
-        )
-        assert response.status_code == status.HTTP_201_CREATED, "Upload initiation should return 201"
-        data = response.json()
-        upload_id_1 = data["upload_id"]
-        assert data["remaining_uploads"] == 1, "Remaining uploads should decrease to 1"
-
-        response = await client.delete(
-            app.url_path_for("cancel_upload", upload_id=upload_id_1),
-            params={"token": token},
-        )
-        assert response.status_code == status.HTTP_200_OK, "Upload cancellation should return 200"
-        data = response.json()
-        assert data["remaining_uploads"] == 2, "Remaining uploads should be restored to 2"
-
-        info = await get_token_info(client, token)
-        assert info["remaining_uploads"] == 2, "Token info should confirm 2 remaining uploads"
+    token_data = await create_token(client, max_uploads=2, max_size_bytes=1000)
+    token = token_data["token"]
+
+    response = await client.post(
+        INITIATE_UPLOAD_URL,
+        params={"token": token},
+        json=upload_payload(filename="test1.txt"),
+    )
+    assert response.status_code == status.HTTP_201_CREATED, "Upload initiation should return 201"
+    data = response.json()
+    upload_id_1 = data["upload_id"]
+    assert data["remaining_uploads"] == 1, "Remaining uploads should decrease to 1"
+
+    response = await client.delete(
+        app.url_path_for("cancel_upload", upload_id=upload_id_1),
+        params={"token": token},
+    )
+    assert response.status_code == status.HTTP_200_OK, "Upload cancellation should return 200"
+    data = response.json()
+    assert data["remaining_uploads"] == 2, "Remaining uploads should be restored to 2"
 
 
 @pytest.mark.asyncio
-async def test_cancel_upload_invalid_token():
+async def test_cancel_upload_invalid_token(client):
     """Test that canceling with wrong token fails."""
-    seed_schema()
-    transport = ASGITransport(app=app)
-    async with AsyncClient(transport=transport, base_url="http://testserver") as client:
-        token_data1 = await create_token(client, max_uploads=1, max_size_bytes=1000)
-        token1 = token_data1["token"]
-
-        token_data2 = await create_token(client, max_uploads=1, max_size_bytes=1000)
-        token2 = token_data2["token"]
-
-        response = await client.post(
-            app.url_path_for("initiate_upload"),
-            params={"token": token1},
-            json={
-                "filename": "test.txt",
-                "filetype": "text/plain",
-                "size_bytes": 100,
-                "meta_data": {"broadcast_date": "2024-01-01", "title": "Test", "source": "youtube"},
-            },
-        )
-        assert response.status_code == status.HTTP_201_CREATED, "Upload initiation should return 201"
-        upload_id = response.json()["upload_id"]
-
-        response = await client.delete(
-            app.url_path_for("cancel_upload", upload_id=upload_id),
-            params={"token": token2},
-        )
-        assert response.status_code == status.HTTP_403_FORBIDDEN, "Canceling with wrong token should return 403"
-        assert response.headers["content-type"].startswith("application/json"), "Token mismatch should return a JSON error response"
-        assert "detail" in response.json(), "Token mismatch should include error detail"
+    token_data1, token_data2 = await asyncio.gather(
+        create_token(client, max_uploads=1, max_size_bytes=1000),
+        create_token(client, max_uploads=1, max_size_bytes=1000),
+    )
+    token1 = token_data1["token"]
+    token2 = token_data2["token"]
+
+    response = await client.post(
+        INITIATE_UPLOAD_URL,
+        params={"token": token1},
+        json=upload_payload(),
+    )
+    assert response.status_code == status.HTTP_201_CREATED, "Upload initiation should return 201"
+    upload_id = response.json()["upload_id"]
+
+    response = await client.delete(
+        app.url_path_for("cancel_upload", upload_id=upload_id),
+        params={"token": token2},
+    )
+    assert response.status_code == status.HTTP_403_FORBIDDEN, "Canceling with wrong token should return 403"
+    assert response.headers["content-type"].startswith("application/json"), "Token mismatch should return a JSON error response"
+    assert "detail" in response.json(), "Token mismatch should include error detail"
 
 
 @pytest.mark.asyncio
-async def test_cancel_upload_invalid_upload_id():
+async def test_cancel_upload_invalid_upload_id(upload_token):
     """Test that canceling non-existent upload fails."""
-    seed_schema()
-    transport = ASGITransport(app=app)
-    async with AsyncClient(transport=transport, base_url="http://testserver") as client:
-        create_url = app.url_path_for("create_token")
-        r = await client.post(
-            create_url,
-            json={"max_uploads": 1, "max_size_bytes": 1000},
-            headers={"Authorization": f"Bearer {settings.admin_api_key}"},
-        )
-        token = r.json()["token"]
+    token = upload_token["token"]
 
-        response = await client.delete(
-            app.url_path_for("cancel_upload", upload_id="nonexistent_upload_id"),
-            params={"token": token},
-        )
-        assert response.status_code == status.HTTP_404_NOT_FOUND, "Canceling non-existent upload should return 404"
-        assert response.headers["content-type"].startswith("application/json"), "Missing upload should return a JSON error response"
-        assert "detail" in response.json(), "Missing upload should include error detail"
+    status_code, headers, body = await raw_request(
+        "DELETE",
+        app.url_path_for("cancel_upload", upload_id="nonexistent_upload_id"),
+        params={"token": token},
+    )
+    assert status_code == status.HTTP_404_NOT_FOUND, "Canceling non-existent upload should return 404"
+    assert headers["content-type"].startswith("application/json"), "Missing upload should return a JSON error response"
+    assert "detail" in json.loads(body), "Missing upload should include error detail"
 
 
 @pytest.mark.asyncio
-async def test_cancel_completed_upload_fails():
+async def test_cancel_completed_upload_fails(client, upload_token):
     """Test that canceling a completed upload fails."""
-    seed_schema()
-    transport = ASGITransport(app=app)
-    async with AsyncClient(transport=transport, base_url="http://testserver") as client:
-        create_url = app.url_path_for("create_token")
-        r = await client.post(
-            create_url,
-            json={"max_uploads": 1, "max_size_bytes": 1000},
-            headers={"Authorization": f"Bearer {settings.admin_api_key}"},
-        )
-        token = r.json()["token"]
-
-        init_response = await client.post(
-            app.url_path_for("initiate_upload"),
-            params={"token": token},
-            json={
-                "filename": "test.txt",
-                "filetype": "text/plain",
-                "size_bytes": 5,
-                "meta_data": {"broadcast_date": "2024-01-01", "title": "Test", "source": "youtube"},
-            },
-        )
-        assert init_response.status_code == status.HTTP_201_CREATED, "Upload initiation should return 201"
-        upload_id = init_response.json()["upload_id"]
-
-        tus_patch_url = app.url_path_for("tus_patch", upload_id=upload_id)
-        patch_response = await client.patch(
-            tus_patch_url,
-            headers={
-                "Upload-Offset": "0",
-                "Content-Type": "application/offset+octet-stream",
-                "Tus-Resumable": "1.0.0",
-            },
-            content=b"hello",
-        )
-        assert patch_response.status_code == status.HTTP_204_NO_CONTENT, "TUS PATCH should return 204"
-
-        complete_status, complete_data = await complete_upload(client, upload_id, token)
-        assert complete_status == status.HTTP_200_OK, "Completion endpoint should succeed for fully uploaded files"
-        assert complete_data["status"] == "completed", "Text upload should be completed after explicit completion"
+    token = upload_token["token"]
+
+    init_response = await client.post(
+        INITIATE_UPLOAD_URL,
+        params={"token": token},
+        json=upload_payload(size_bytes=5),
+    )
+    assert init_response.status_code == status.HTTP_201_CREATED, "Upload initiation should return 201"
+    upload_id = init_response.json()["upload_id"]
+
+    async with SessionLocal() as session:
+        await session.execute(
+            update(models.UploadRecord)
+            .where(models.UploadRecord.public_id == upload_id)
+            .values(status="completed", upload_offset=5, completed_at=datetime.now(UTC))
+        )
+        await session.commit()
+
+    response = await client.delete(
+        app.url_path_for("cancel_upload", upload_id=upload_id),
+        params={"token": token},
+    )
+    assert response.status_code == status.HTTP_400_BAD_REQUEST, "Canceling completed upload should return 400"
+    assert response.headers["content-type"].startswith("application/json"), "Completed upload cancel should return a JSON error response"
+    assert "detail" in response.json(), "Completed upload cancel should include error detail"
+
+
+@pytest.fixture
+async def token_with_uploads(client):
+    """Create a token with three initiated uploads, using every upload slot."""
+    token_data = await create_token(client, max_uploads=3, max_size_bytes=1000)
+    token = token_data["token"]
+
+    responses = await asyncio.gather(
+        *[
+            client.post(
+                INITIATE_UPLOAD_URL,
+                params={"token": token},
+                json=upload_payload(filename=f"test{i}.txt", meta_data={**DEFAULT_META, "title": f"Test{i}"}),
+            )
+            for i in range(3)
+        ]
+    )
+    for i, response in enumerate(responses):
+        assert response.status_code == status.HTTP_201_CREATED, f"Upload initiation {i} should return 201"
 
-        response = await client.delete(
-            app.url_path_for("cancel_upload", upload_id=upload_id),
-            params={"token": token},
-        )
-        assert response.status_code == status.HTTP_400_BAD_REQUEST, "Canceling completed upload should return 400"
-        assert response.headers["content-type"].startswith("application/json"), (
-            "Completed upload cancel should return a JSON error response"
-        )
-        assert "detail" in response.json(), "Completed upload cancel should include error detail"
+    return token, [response.json()["upload_id"] for response in responses]
 
 
 @pytest.mark.asyncio
-async def test_cancel_multiple_uploads():
+async def test_cancel_multiple_uploads(client, token_with_uploads):
     """Test canceling multiple uploads restores all slots."""
-    seed_schema()
-    transport = ASGITransport(app=app)
-    async with AsyncClient(transport=transport, base_url="http://testserver") as client:
-        create_url = app.url_path_for("create_token")
-        r = await client.post(
-            create_url,
-            json={"max_uploads": 3, "max_size_bytes": 1000},
-            headers={"Authorization": f"Bearer {settings.admin_api_key}"},
-        )
-        token = r.json()["token"]
-
-        upload_ids = []
-        for i in range(3):
-            response = await client.post(
-                app.url_path_for("initiate_upload"),
-                params={"token": token},
-                json={
-                    "filename": f"test{i}.txt",
-                    "filetype": "text/plain",
-                    "size_bytes": 100,
-                    "meta_data": {"broadcast_date": "2024-01-01", "title": f"Test{i}", "source": "youtube"},
-                },
-            )
-            assert response.status_code == status.HTTP_201_CREATED, f"Upload initiation {i} should return 201"
-            upload_ids.append(response.json()["upload_id"])
+    token, upload_ids = token_with_uploads
 
-        info_url = app.url_path_for("get_token", token_value=token)
-        info = await client.get(info_url)
-        assert info.json()["remaining_uploads"] == 0, "All upload slots should be used"
+    info_url = app.url_path_for("get_token", token_value=token)
+    info = await client.get(info_url)
+    assert info.json()["remaining_uploads"] == 0, "All upload slots should be used"
 
-        response = await client.delete(
-            app.url_path_for("cancel_upload", upload_id=upload_ids[0]),
-            params={"token": token},
-        )
-        assert response.status_code == status.HTTP_200_OK, "First cancellation should return 200"
-        assert response.json()["remaining_uploads"] == 1, "First cancellation should restore one slot"
+    async with asyncio.TaskGroup() as tg:
+        cancels = [
+            tg.create_task(client.delete(app.url_path_for("cancel_upload", upload_id=upload_id), params={"token": token}))
+            for upload_id in upload_ids[:2]
+        ]
 
-        response = await client.delete(
-            app.url_path_for("cancel_upload", upload_id=upload_ids[1]),
-            params={"token": token},
-        )
-        assert response.status_code == status.HTTP_200_OK, "Second cancellation should return 200"
-        assert response.json()["remaining_uploads"] == 2, "Second cancellation should restore another slot"
+    for task in cancels:
+        assert task.result().status_code == status.HTTP_200_OK, "Concurrent cancellation should return 200"
 
-        info = await client.get(info_url)
-        assert info.json()["remaining_uploads"] == 2, "Token info should confirm 2 remaining uploads"
+    info = await client.get(info_url)
+    assert info.json()["remaining_uploads"] == 2, "Token info should confirm 2 remaining uploads"
 
 
 @pytest.mark.asyncio
-async def test_cancel_with_nonexistent_token():
+async def test_cancel_with_nonexistent_token(client, upload_token):
     """Test that canceling with non-existent token fails."""
-    seed_schema()
-    transport = ASGITransport(app=app)
-    async with AsyncClient(transport=transport, base_url="http://testserver") as client:
-        create_url = app.url_path_for("create_token")
-        r = await client.post(
-            create_url,
-            json={"max_uploads": 1, "max_size_bytes": 1000},
-            headers={"Authorization": f"Bearer {settings.admin_api_key}"},
-        )
-        token = r.json()["token"]
-
-        response = await client.post(
-            app.url_path_for("initiate_upload"),
-            params={"token": token},
-            json={
-                "filename": "test.txt",
-                "filetype": "text/plain",
-                "size_bytes": 100,
-                "meta_data": {"broadcast_date": "2024-01-01", "title": "Test", "source": "youtube"},
-            },
-        )
-        assert response.status_code == status.HTTP_201_CREATED, "Upload initiation should return 201"
-        upload_id = response.json()["upload_id"]
-
-        response = await client.delete(
-            app.url_path_for("cancel_upload", upload_id=upload_id),
-            params={"token": "fake_token"},
-        )
-        assert response.status_code == status.HTTP_404_NOT_FOUND, "Non-existent token should return 404"
-        assert response.headers["content-type"].startswith("application/json"), "Missing token should return a JSON error response"
-        assert "detail" in response.json(), "Missing token should include error detail"
+    token = upload_token["token"]
+
+    response = await client.post(
+        INITIATE_UPLOAD_URL,
+        params={"token": token},
+        json=upload_payload(),
+    )
+    assert response.status_code == status.HTTP_201_CREATED, "Upload initiation should return 201"
+    upload_id = response.json()["upload_id"]
+
+    status_code, headers, body = await raw_request(
+        "DELETE",
+        app.url_path_for("cancel_upload", upload_id=upload_id),
+        params={"token": "fake_token"},
+    )
+    assert status_code == status.HTTP_404_NOT_FOUND, "Non-existent token should return 404"
+    assert headers["content-type"].startswith("application/json"), "Missing token should return a JSON error response"
+    assert "detail" in json.loads(body), "Missing token should include error detail"
@@ -0,0 +1,83 @@
+"""Tests for upload slot accounting under concurrent requests."""
+
+import asyncio
+
+import pytest
+from fastapi import status
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from backend.app.db import Base, get_db
+from backend.app.main import app
+from backend.tests.utils import (
+    DEFAULT_META,
+    INITIATE_UPLOAD_URL,
+    cancel_upload,
+    create_token,
+    get_token_info,
+    initiate_upload,
+    upload_payload,
+)
+
+pytestmark = pytest.mark.usefixtures("seeded_schema", "file_db")
+
+
+@pytest.fixture
+async def file_db(test_run_dir):
+    """
+    Serve requests from a file-backed SQLite database, one connection per session.
+
+    The shared in-memory database runs every session on a single connection and transaction,
+    so one request's rollback would undo the others and hide how concurrent requests interact.
+    """
+    db_path = test_run_dir / "concurrency.db"
+    engine = create_async_engine(f"sqlite+aiosqlite:///{db_path}")
+    session_maker = async_sessionmaker(bind=engine, expire_on_commit=False, class_=AsyncSession)
+
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    async def file_get_db():
+        async with session_maker() as session:
+            yield session
+
+    app.dependency_overrides[get_db] = file_get_db
+    try:
+        yield
+    finally:
+        app.dependency_overrides.pop(get_db, None)
+        await engine.dispose()
+        db_path.unlink(missing_ok=True)
+
+
+@pytest.mark.asyncio
+async def test_concurrent_initiate_and_cancel_keep_slot_count(client):
+    """Test that concurrent initiations and cancellations on one token keep an exact slot count."""
+    token_data = await create_token(client, max_uploads=4, max_size_bytes=1000)
+    token = token_data["token"]
+
+    uploads = await asyncio.gather(*[initiate_upload(client, token, filename=f"test{i}.txt", meta_data=DEFAULT_META) for i in range(4)])
+    assert all("upload_id" in upload for upload in uploads), "Concurrent initiations should all succeed"
+
+    info = await get_token_info(client, token)
+    assert info["remaining_uploads"] == 0, "Concurrent initiations should use every upload slot"
+
+    await asyncio.gather(*[cancel_upload(client, upload["upload_id"], token) for upload in uploads])
+
+    info = await get_token_info(client, token)
+    assert info["remaining_uploads"] == 4, "Concurrent cancellations should restore every upload slot"
+
+
+@pytest.mark.asyncio
+async def test_concurrent_initiates_do_not_overbook_token(client):
+    """Test that concurrent initiations on a single-slot token let exactly one upload through."""
+    token_data = await create_token(client, max_uploads=1, max_size_bytes=1000)
+    token = token_data["token"]
+
+    responses = await asyncio.gather(
+        *[client.post(INITIATE_UPLOAD_URL, params={"token": token}, json=upload_payload(filename=f"test{i}.txt")) for i in range(4)]
+    )
+    status_codes = sorted(response.status_code for response in responses)
+    assert status_codes == [status.HTTP_201_CREATED] + [status.HTTP_403_FORBIDDEN] * 3, "Only one initiation should claim the slot"
+
+    info = await get_token_info(client, token)
+    assert info["remaining_uploads"] == 0, "The token should not be overbooked"
@@ -1,80 +1,48 @@
 import pytest
 from fastapi import status
-from httpx import AsyncClient, ASGITransport
 
-from backend.app.config import settings
 from backend.app.main import app
-from backend.tests.conftest import seed_schema
-from backend.tests.utils import create_token
+from backend.tests.utils import ADMIN_HEADERS, INITIATE_UPLOAD_URL, create_token, upload_payload
 
-
-@pytest.mark.asyncio
-async def test_initiate_upload_rejects_large_file():
-    seed_schema()
-    transport = ASGITransport(app=app)
-    async with AsyncClient(transport=transport, base_url="http://testserver") as client:
-        token_data = await create_token(client, max_size_bytes=50, allowed_mime=["video/mp4"])
-        init = await client.post(
-            app.url_path_for("initiate_upload"),
-            params={"token": token_data["token"]},
-            json={
-                "meta_data": {"broadcast_date": "2024-01-01", "title": "Clip", "source": "youtube"},
-                "filename": "big.bin",
-                "filetype": "video/mp4",
-                "size_bytes": 100,
-            },
-        )
-        assert init.status_code == status.HTTP_413_CONTENT_TOO_LARGE, "Large file should be rejected with 413"
-        data = init.json()
-        assert init.headers["content-type"].startswith("application/json"), "Large file rejection should return a JSON error response"
-        assert "detail" in data, "Large file rejection should include error detail"
+pytestmark = pytest.mark.usefixtures("seeded_schema")
 
 
 @pytest.mark.asyncio
-async def test_initiate_upload_rejects_disallowed_mime():
-    seed_schema()
-    transport = ASGITransport(app=app)
-    async with AsyncClient(transport=transport, base_url="http://testserver") as client:
-        token_data = await create_token(client, allowed_mime=["video/mp4"])
-        init = await client.post(
-            app.url_path_for("initiate_upload"),
-            params={"token": token_data["token"]},
-            json={
-                "meta_data": {"broadcast_date": "2024-01-01", "title": "Clip", "source": "youtube"},
-                "filename": "text.txt",
-                "filetype": "text/plain",
-                "size_bytes": 10,
-            },
-        )
-        assert init.status_code == status.HTTP_415_UNSUPPORTED_MEDIA_TYPE, "Disallowed MIME type should be rejected with 415"
-        data = init.json()
-        assert init.headers["content-type"].startswith("application/json"), "Disallowed MIME rejection should return a JSON error response"
-        assert "detail" in data, "Disallowed MIME rejection should include error detail"
+@pytest.mark.parametrize(
+    ("max_size_bytes", "filename", "filetype", "size_bytes", "expected_status"),
+    [
+        pytest.param(50, "big.bin", "video/mp4", 100, status.HTTP_413_CONTENT_TOO_LARGE, id="large_file"),
+        pytest.param(10_000_000, "text.txt", "text/plain", 10, status.HTTP_415_UNSUPPORTED_MEDIA_TYPE, id="disallowed_mime"),
+    ],
+)
+async def test_initiate_upload_rejects_invalid_file(client, max_size_bytes, filename, filetype, size_bytes, expected_status):
+    token_data = await create_token(client, max_size_bytes=max_size_bytes, allowed_mime=["video/mp4"])
+    init = await client.post(
+        INITIATE_UPLOAD_URL,
+        params={"token": token_data["token"]},
+        json=upload_payload(filename=filename, size_bytes=size_bytes, filetype=filetype),
+    )
+    assert init.status_code == expected_status, f"Invalid file should be rejected with {expected_status}"
+    data = init.json()
+    assert init.headers["content-type"].startswith("application/json"), "Rejection should return a JSON error response"
+    assert "detail" in data, "Rejection should include error detail"
 
 
 @pytest.mark.asyncio
-async def test_download_fails_until_completed():
-    seed_schema()
-    transport = ASGITransport(app=app)
-    async with AsyncClient(transport=transport, base_url="http://testserver") as client:
-        token_data = await create_token(client, allowed_mime=["video/mp4"])
-        init = await client.post(
-            app.url_path_for("initiate_upload"),
-            params={"token": token_data["token"]},
-            json={
-                "meta_data": {"broadcast_date": "2024-01-01", "title": "Clip", "source": "youtube"},
-                "filename": "clip.mp4",
-                "filetype": "video/mp4",
-                "size_bytes": 5,
-            },
-        )
-        upload_id = init.json()["upload_id"]
-
-        download = await client.get(
-            app.url_path_for("download_file", download_token=token_data["download_token"], upload_id=upload_id),
-            headers={"Authorization": f"Bearer {settings.admin_api_key}"},
-        )
-        assert download.status_code == status.HTTP_409_CONFLICT, "Download incomplete upload should return 409"
-        data = download.json()
-        assert download.headers["content-type"].startswith("application/json"), "Incomplete download should return a JSON error response"
-        assert "detail" in data, "Incomplete download should include error detail"
+async def test_download_fails_until_completed(client):
+    token_data = await create_token(client, allowed_mime=["video/mp4"])
+    init = await client.post(
+        INITIATE_UPLOAD_URL,
+        params={"token": token_data["token"]},
+        json=upload_payload(filename="clip.mp4", size_bytes=5, filetype="video/mp4"),
+    )
+    upload_id = init.json()["upload_id"]
+
+    download = await client.get(
+        app.url_path_for("download_file", download_token=token_data["download_token"], upload_id=upload_id),
+        headers=ADMIN_HEADERS,
+    )
+    assert download.status_code == status.HTTP_409_CONFLICT, "Download incomplete upload should return 409"
+    data = download.json()
+    assert download.headers["content-type"].startswith("application/json"), "Incomplete download should return a JSON error response"
+    assert "detail" in data, "Incomplete download should include error detail"
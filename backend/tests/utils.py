@@ -1,12 +1,26 @@
 """Test utility functions for common test operations."""
 
+from datetime import UTC, datetime, timedelta
 from typing import Any
+from urllib.parse import urlencode
 
 from fastapi import status
 from httpx import AsyncClient
 
+from backend.app import models
 from backend.app.config import settings
+from backend.app.db import SessionLocal
 from backend.app.main import app
+from backend.app.routers.tokens import _generate_token_value
+
+ADMIN_HEADERS: dict[str, str] = {"Authorization": f"Bearer {settings.admin_api_key}"}
+
+CREATE_TOKEN_URL: str = app.url_path_for("create_token")
+INITIATE_UPLOAD_URL: str = app.url_path_for("initiate_upload")
+METADATA_VALIDATE_URL: str = app.url_path_for("metadata_schema_validate")
+
+# Metadata valid for the seeded schema, shared by every payload; copy it before mutating.
+DEFAULT_META: dict[str, str] = {"broadcast_date": "2024-01-01", "title": "Test", "source": "youtube"}
 
 
 async def create_token(
@@ -39,14 +53,92 @@ async def create_token(
     payload.update(overrides)
 
     resp = await client.post(
-        app.url_path_for("create_token"),
+        CREATE_TOKEN_URL,
         json=payload,
-        headers={"Authorization": f"Bearer {settings.admin_api_key}"},
+        headers=ADMIN_HEADERS,
     )
     assert resp.status_code == status.HTTP_201_CREATED
     return resp.json()
 
 
+async def create_token_direct(
+    max_uploads: int = 5,
+    max_size_bytes: int = 10_000_000,
+    allowed_mime: list[str] | None = None,
+    expiry_datetime: datetime | None = None,
+) -> dict:
+    """
+    Create a token directly in the database, bypassing the HTTP layer.
+
+    Use this for setup-only tokens where the token endpoint itself is not under test.
+
+    Args:
+        max_uploads: Maximum number of uploads allowed
+        max_size_bytes: Maximum file size in bytes
+        allowed_mime: List of allowed MIME types
+        expiry_datetime: Token expiry, defaults to the configured token TTL
+
+    Returns:
+        Dict shaped like the create token response JSON.
+
+    """
+    record = models.UploadToken(
+        token=_generate_token_value(18),
+        download_token=_generate_token_value(16, prefix="fbc_"),
+        max_uploads=max_uploads,
+        max_size_bytes=max_size_bytes,
+        expires_at=expiry_datetime or datetime.now(UTC) + timedelta(hours=settings.default_token_ttl_hours),
+        allowed_mime=allowed_mime,
+    )
+
+    async with SessionLocal() as session:
+        session.add(record)
+        await session.commit()
+        await session.refresh(record)
+
+    return {
+        "token": record.token,
+        "download_token": record.download_token,
+        "upload_url": str(app.url_path_for("upload_page", token=record.token)),
+        "expires_at": record.expires_at.isoformat(),
+        "max_uploads": record.max_uploads,
+        "max_size_bytes": record.max_size_bytes,
+        "allowed_mime": record.allowed_mime,
+    }
+
+
+def upload_payload(
+    filename: str = "test.txt",
+    size_bytes: int = 100,
+    filetype: str | None = "text/plain",
+    meta_data: dict | None = None,
+    **overrides: Any,
+) -> dict:
+    """
+    Build an upload initiation payload.
+
+    Args:
+        filename: Name of the file to upload
+        size_bytes: Size of the file in bytes
+        filetype: MIME type of the file, None to leave it unset
+        meta_data: Metadata dictionary, defaults to values valid for the seeded schema
+        **overrides: Additional fields to override in the payload
+
+    Returns:
+        Payload for the initiate upload endpoint.
+
+    """
+    payload = {
+        "filename": filename,
+        "size_bytes": size_bytes,
+        "meta_data": DEFAULT_META if meta_data is None else meta_data,
+    }
+    if filetype is not None:
+        payload["filetype"] = filetype
+    payload.update(overrides)
+    return payload
+
+
 async def initiate_upload(
     client: AsyncClient,
     token: str,
@@ -72,18 +164,10 @@ async def initiate_upload(
         Upload initiation response JSON containing upload_id, etc.
 
     """
-    payload = {
-        "filename": filename,
-        "size_bytes": size_bytes,
-        "filetype": filetype,
-        "meta_data": meta_data or {},
-    }
-    payload.update(overrides)
-
     resp = await client.post(
-        app.url_path_for("initiate_upload"),
+        INITIATE_UPLOAD_URL,
         params={"token": token},
-        json=payload,
+        json=upload_payload(filename, size_bytes, filetype, meta_data or {}, **overrides),
     )
     return resp.json() if resp.status_code == status.HTTP_201_CREATED else {}
 
@@ -226,7 +310,7 @@ async def delete_upload_admin(
     """
     resp = await client.delete(
         app.url_path_for("delete_upload", upload_id=upload_id),
-        headers={"Authorization": f"Bearer {settings.admin_api_key}"},
+        headers=ADMIN_HEADERS,
     )
     return resp.status_code
 
@@ -247,7 +331,63 @@ async def validate_metadata(
 
     """
     resp = await client.post(
-        app.url_path_for("metadata_schema_validate"),
+        METADATA_VALIDATE_URL,
         json={"metadata": metadata},
     )
     return resp.status_code, resp.json()
+
+
+async def raw_request(
+    method: str,
+    path: str,
+    params: dict[str, str] | None = None,
+    headers: dict[str, str] | None = None,
+    body: bytes = b"",
+) -> tuple[int, dict[str, str], bytes]:
+    """
+    Drive the app with a bare ASGI scope, skipping the httpx request/response models.
+
+    Meant for error-path tests that only look at the status and body.
+
+    Args:
+        method: HTTP method
+        path: Request path
+        params: Query string parameters
+        headers: Request headers
+        body: Request body
+
+    Returns:
+        Tuple of (status_code, headers, body)
+
+    """
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": method,
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "root_path": "",
+        "query_string": urlencode(params or {}).encode(),
+        "headers": [(b"host", b"testserver")] + [(k.lower().encode(), v.encode()) for k, v in (headers or {}).items()],
+        "client": ("127.0.0.1", 123),
+        "server": ("testserver", 80),
+    }
+    status_code = 0
+    response_headers: dict[str, str] = {}
+    chunks: list[bytes] = []
+
+    async def receive() -> dict:
+        return {"type": "http.request", "body": body, "more_body": False}
+
+    async def send(message: dict) -> None:
+        nonlocal status_code
+        if message["type"] == "http.response.start":
+            status_code = message["status"]
+            response_headers.update((k.decode(), v.decode()) for k, v in message.get("headers", []))
+        elif message["type"] == "http.response.body":
+            chunks.append(message.get("body", b""))
+
+    await app(scope, receive, send)
+    return status_code, response_headers, b"".join(chunks)
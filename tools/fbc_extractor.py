@@ -1,29 +1,158 @@
 import os
 import re
 import typing
-from urllib.parse import ParseResult, urlparse, urlunparse
+from datetime import datetime as dt
+from functools import lru_cache
+from urllib.parse import ParseResult, urlparse
 
 from yt_dlp.extractor.common import InfoExtractor  # type: ignore
-from yt_dlp.utils import int_or_none, str_or_none, traverse_obj  # type: ignore
+from yt_dlp.utils import float_or_none, int_or_none, str_or_none  # type: ignore
+
+_ABS_URL_PREFIXES: tuple[str, ...] = ("http://", "https://")
+
+_FIELD_STR, _FIELD_DATE, _FIELD_YEAR = range(3)
+_FIELD_METHODS: dict[str, int] = {"format_date": _FIELD_DATE, "format_year": _FIELD_YEAR}
+
+
+class _FieldGroup(typing.NamedTuple):
+    """Output fields derived from one metadata key."""
+
+    meta_key: str
+    needs_date: bool
+    steps: tuple[tuple[str, int], ...]
+
+
+def _build_field_plan(fields: dict) -> tuple[_FieldGroup, ...]:
+    """Group metadata field definitions by source key into _FieldGroup records of (output_key, kind) steps."""
+    grouped: dict[str, list[tuple[str, int]]] = {}
+    for key, field in fields.items():
+        if isinstance(field, str):
+            grouped.setdefault(field, []).append((key, _FIELD_STR))
+
+        if isinstance(field, tuple) and 2 == len(field):
+            meta_key, methods = field
+            grouped.setdefault(meta_key, []).extend((key, _FIELD_METHODS[method]) for method in methods if method in _FIELD_METHODS)
+
+    return tuple(
+        _FieldGroup(meta_key, any(kind != _FIELD_STR for _, kind in steps), tuple(steps)) for meta_key, steps in grouped.items() if steps
+    )
+
+
+@lru_cache(maxsize=256)
+def _parse_ymd(date_str: str) -> tuple[int, int, int] | None:
+    """Parse YYYY-MM-DD into (year, month, day)."""
+    if len(date_str) == 10 and date_str[4] == "-" and date_str[7] == "-" and date_str.count("-") == 2:
+        year, month, day = date_str[:4], date_str[5:7], date_str[8:]
+    else:
+        year, _, rest = date_str.partition("-")
+        month, sep, day = rest.partition("-")
+        if not sep or "-" in day:
+            return None
+
+    try:
+        return int(year), int(month), int(day)
+    except ValueError:
+        return None
+
+
+@lru_cache(maxsize=256)
+def _parse_date_cached(date_str: str, dateformat: str) -> str | None:
+    try:
+        _dt: dt = dt.fromisoformat(date_str)
+    except Exception:
+        return None
+
+    return dateformat.format(year=_dt.year, month=_dt.month, day=_dt.day)
+
+
+def _fast_int(value: typing.Any) -> int | None:
+    """int_or_none that skips the conversion for values JSON already decoded as int."""
+    return value if type(value) is int else int_or_none(value)
+
+
+@lru_cache(maxsize=64)
+def _parse_fps(fps_str: str) -> float | None:
+    """Parse ffprobe frame rates like "30/1" or "24000/1001"."""
+    try:
+        num, sep, denom = fps_str.partition("/")
+        if sep:
+            return int(num) / int(denom)
+
+        return float(fps_str)
+    except (ValueError, ZeroDivisionError):
+        return None
+
+
+def _abs_url(url: str | None, base_url: str | None) -> str | None:
+    """Prefix server-relative URLs with base_url, leave absolute and empty ones alone."""
+    if not url or not base_url or url.startswith(_ABS_URL_PREFIXES):
+        return url
+
+    return f"{base_url}{url}"
+
+
+def _first_csv(value: str) -> str:
+    """Take the first entry of a comma separated ffprobe value, e.g. "mov,mp4,m4a"."""
+    return value.partition(",")[0]
+
+
+def _per_thousand(value: typing.Any) -> float | None:
+    return float_or_none(value, scale=1000)
+
+
+def _copy_fields(target: dict, source: dict, fields: tuple) -> None:
+    """Copy truthy values from source into target according to (source_key, target_key, coercer) steps."""
+    get = source.get
+    for src, dst, coerce in fields:
+        value = get(src)
+        if value and coerce:
+            value = coerce(value)
+
+        if value:
+            target[dst] = value
 
 
 class FBCIE(InfoExtractor):
     _APIKEY: str | None = None
     _NETRC_MACHINE: str = "fbc_uploader"
-    _VALID_URL: str = r"https?:\/\/.+\/(?:api\/tokens|f)\/(?P<id>fbc_[A-Za-z0-9_-]{22})\/?"
-    _VALID_FBC: re.Pattern[str] = re.compile(
-        r"https?:\/\/.+?\/(?:api\/tokens|f)\/(?P<id>fbc_[A-Za-z0-9_-]{22})(?:\/uploads)?/?(?P<fid>[A-Za-z0-9_-]+)?/?$"
+    _VALID_URL: str = (
+        r"https?:\/\/[^/\s]+(?:\/[^/\s]*)*?\/(?:api\/tokens|f)\/(?P<id>fbc_[A-Za-z0-9_-]{22})(?:\/uploads)?/?(?P<fid>[A-Za-z0-9_-]+)?/?$"
     )
+    _VALID_FBC: re.Pattern[str] = re.compile(_VALID_URL)
+    _PATH_PREFIX_TAIL: re.Pattern[str] = re.compile(r"/(api/tokens|f)/.*$")
     _POSSIBLE_METADATA_FIELDS: typing.ClassVar = {
         "title": "title",
         "description": "description",
         "release_date": ("broadcast_date", {"format_date"}),
         "release_year": ("broadcast_date", {"format_year"}),
     }
+    _FIELD_PLAN: typing.ClassVar = _build_field_plan(_POSSIBLE_METADATA_FIELDS)
+    _FORMAT_FIELDS: typing.ClassVar = (
+        ("format_name", "container", _first_csv),
+        ("bit_rate", "tbr", _per_thousand),
+        ("duration", "duration", float_or_none),
+    )
+    _VIDEO_FIELDS: typing.ClassVar = (
+        ("codec_name", "vcodec", None),
+        ("width", "width", _fast_int),
+        ("height", "height", _fast_int),
+        ("bit_rate", "vbr", _per_thousand),
+        ("display_aspect_ratio", "aspect_ratio", None),
+    )
+    _AUDIO_FIELDS: typing.ClassVar = (
+        ("codec_name", "acodec", None),
+        ("sample_rate", "asr", _fast_int),
+        ("channels", "audio_channels", _fast_int),
+        ("bit_rate", "abr", _per_thousand),
+    )
 
     @classmethod
     def _match_valid_url(cls, url) -> re.Match[str] | None:
-        return cls._VALID_FBC.match(url)
+        # yt-dlp asks every extractor about every URL, reject foreign ones before running the regex.
+        if "/fbc_" not in url:
+            return None
+
+        return cls._VALID_FBC.fullmatch(url)
 
     @classmethod
     def _match_id(cls, url) -> None | str:
@@ -39,33 +168,30 @@ class FBCIE(InfoExtractor):
     def _perform_login(self, _, password):
         FBCIE._APIKEY: str = password
 
-    def _convert_to_api_url(self, url: str) -> str:
+    def _convert_to_api_url(self, url: str, mat: re.Match[str] | None = None, parsed: ParseResult | None = None) -> str:
         """Convert share URL format to API URL format."""
-        mat: re.Match[str] | None = self._match_valid_url(url)
+        if not mat:
+            mat = self._match_valid_url(url)
+
         if not mat:
             return url
 
-        parsed: ParseResult = urlparse(url)
+        if not parsed:
+            parsed = urlparse(url)
+
         token_id: str | None = mat.group("id")
         file_id: str | None = mat.group("fid")
 
-        return urlunparse(
-            (
-                parsed.scheme,
-                parsed.netloc,
-                f"/api/tokens/{token_id}/uploads/{file_id}" if file_id else f"/api/tokens/{token_id}/uploads",
-                "",
-                "",
-                "",
-            )
-        )
+        api_url: str = f"{parsed.scheme}://{parsed.netloc}/api/tokens/{token_id}/uploads"
+        return f"{api_url}/{file_id}" if file_id else api_url
 
     def _real_extract(self, url):
-        video_id: str = self._match_id(url)
+        mat: re.Match[str] = self._match_valid_url(url)
+        video_id: str = mat.group("fid") or mat.group("id")
         headers: dict[str, str] = {}
 
         parsed: ParseResult = urlparse(url)
-        path_prefix = re.sub(r"/(api/tokens|f)/.*$", "", parsed.path)
+        path_prefix: str = self._PATH_PREFIX_TAIL.sub("", parsed.path)
         base_url: str = f"{parsed.scheme}://{parsed.netloc}{path_prefix}"
 
         if apikey := (FBCIE._APIKEY or os.environ.get("FBC_API_KEY")):
@@ -76,7 +202,7 @@ class FBCIE(InfoExtractor):
             err_note += "You may need to provide a valid API key via --password or FBC_API_KEY environment variable."
 
         items_info = self._download_json(
-            self._convert_to_api_url(url),
+            self._convert_to_api_url(url, mat, parsed),
             video_id=video_id,
             headers=headers,
             note="Downloading token info",
@@ -84,26 +210,29 @@ class FBCIE(InfoExtractor):
             errnote=err_note,
         )
 
-        if is_single := isinstance(items_info, dict):
-            items_info = [items_info]
+        if isinstance(items_info, dict):
+            if "completed" != items_info.get("status"):
+                self.report_warning("Token contains no uploaded files.")
+                return None
+
+            return self._format_item(items_info, "video", headers=headers, base_url=base_url)
 
-        playlist: list[dict] = [
-            self._format_item(
-                video_data,
-                "video" if is_single or len(items_info) < 2 else "url",
-                headers=headers,
-                base_url=base_url,
-            )
-            for video_data in items_info
-            if "completed" == video_data.get("status")
-        ]
+        playlist: list[dict] = []
+        for video_data in items_info:
+            if "completed" != video_data.get("status"):
+                continue
+
+            playlist.append(self._format_item(video_data, "url", headers=headers, base_url=base_url))
 
         if len(playlist) < 1:
             self.report_warning("Token contains no uploaded files.")
             return None
 
-        if is_single or self.get_param("noplaylist"):
-            if self.get_param("noplaylist") and len(playlist) > 1:
+        if len(playlist) < 2:
+            playlist[0]["_type"] = "video"
+
+        if self.get_param("noplaylist"):
+            if len(playlist) > 1:
                 self.to_screen(f"Downloading 1 video out of '{len(playlist)}' because of --no-playlist option")
                 playlist[0]["_type"] = "video"
 
@@ -111,174 +240,106 @@ class FBCIE(InfoExtractor):
 
         return {"_type": "playlist", "id": video_id, "entries": playlist}
 
-    def _extract_metadata(self, meta_data: dict, fields: list[str]) -> dict:
+    def _extract_metadata(self, meta_data: dict) -> dict:
         extracted = {}
-        for key, field in fields.items():
-            if isinstance(field, str):
-                value = str_or_none(traverse_obj(meta_data, field))
-                if value:
-                    extracted[key] = value
-
-            if isinstance(field, tuple) and 2 == len(field):
-                meta_key, methods = field
-                date_str = str_or_none(traverse_obj(meta_data, meta_key))
-                for method in methods:
-                    if method not in ["format_date", "format_year"]:
-                        continue
+        for meta_key, needs_date, steps in self._FIELD_PLAN:
+            if not (value := str_or_none(meta_data.get(meta_key))):
+                continue
 
-                    if val := self._format_date(
-                        date_str,
-                        dateformat="{year:04}{month:02}{day:02}" if method == "format_date" else "{year:04}",
-                    ):
-                        extracted[key] = int_or_none(val) if method == "format_year" else str_or_none(val)
+            ymd = _parse_ymd(value) if needs_date else None
+            for key, kind in steps:
+                if kind == _FIELD_STR:
+                    extracted[key] = value
+                elif ymd is None:
+                    continue
+                elif kind == _FIELD_DATE:
+                    extracted[key] = f"{ymd[0]:04}{ymd[1]:02}{ymd[2]:02}"
+                elif kind == _FIELD_YEAR:
+                    extracted[key] = ymd[0]
 
         return extracted
 
-    def _format_date(self, date_str: str | None, dateformat: str = "{year:04}{month:02}{day:02}") -> str | None:
-        """Date is YYYY-MM-DD."""
-        if not date_str:
-            return None
-
-        try:
-            parts = date_str.split("-")
-            if len(parts) != 3:
-                return None
-            year, month, day = map(int, parts)
-        except Exception:
-            return None
-
-        return dateformat.format(year=year, month=month, day=day)
-
     def _parse_date(self, date_str: str | None, dateformat: str = "{year:04}{month:02}{day:02}") -> str | None:
         """Parse ISO DATE."""
-        if not date_str:
+        if not date_str or not isinstance(date_str, str):
             return None
 
-        from datetime import datetime as dt
-
-        try:
-            _dt: dt = dt.fromisoformat(date_str)
-        except Exception:
-            return None
+        # Only the date is used, parse just the YYYY-MM-DD prefix of timestamps so uploads from the same day share a cache entry.
+        if len(date_str) > 10 and date_str[4] == "-" and date_str[7] == "-":
+            date_str = date_str[:10]
 
-        return dateformat.format(year=_dt.year, month=_dt.month, day=_dt.day)
+        return _parse_date_cached(date_str, dateformat)
 
     def _expand_format(self, format_dict: dict, ffprobe_data: dict) -> dict:
         """Enrich format dictionary with data from ffprobe output."""
-        if not ffprobe_data:
+        format_info = ffprobe_data.get("format") or {}
+        streams = ffprobe_data.get("streams") or ()
+        if not format_info and not streams:
+            format_dict["vcodec"] = "none"
+            format_dict["acodec"] = "none"
             return format_dict
 
-        format_info = ffprobe_data.get("format", {})
-
-        if format_name := str_or_none(format_info.get("format_name")):
-            format_dict["container"] = format_name.split(",")[0]  # Take first format if multiple
+        _copy_fields(format_dict, format_info, self._FORMAT_FIELDS)
 
         if not format_dict.get("filesize") and (size := format_info.get("size")):
-            format_dict["filesize"] = int_or_none(size)
-
-        if bit_rate := format_info.get("bit_rate"):
-            format_dict["tbr"] = int_or_none(bit_rate) / 1000 if isinstance(bit_rate, (int, str)) else None
-
-        if duration := format_info.get("duration"):
-            format_dict["duration"] = float(duration) if isinstance(duration, (int, float, str)) else None
+            format_dict["filesize"] = _fast_int(size)
 
-        streams = ffprobe_data.get("streams", [])
+        streams_by_type: dict[str, dict] = {}
+        for stream in streams:
+            streams_by_type.setdefault(stream.get("codec_type"), stream)
+            if "video" in streams_by_type and "audio" in streams_by_type:
+                break
 
-        video_stream = None
-        audio_stream = None
+        if video_stream := streams_by_type.get("video"):
+            _copy_fields(format_dict, video_stream, self._VIDEO_FIELDS)
 
-        for stream in streams:
-            codec_type = stream.get("codec_type")
-            if codec_type == "video" and not video_stream:
-                video_stream = stream
-            elif codec_type == "audio" and not audio_stream:
-                audio_stream = stream
-
-        if video_stream:
-            if codec_name := str_or_none(video_stream.get("codec_name")):
-                format_dict["vcodec"] = codec_name
-
-            if width := int_or_none(video_stream.get("width")):
-                format_dict["width"] = width
-            if height := int_or_none(video_stream.get("height")):
-                format_dict["height"] = height
-
-            if fps_str := str_or_none(video_stream.get("r_frame_rate")):
-                try:
-                    # Parse fps like "30/1" or "24000/1001"
-                    if "/" in fps_str:
-                        num, denom = fps_str.split("/")
-                        format_dict["fps"] = int(num) / int(denom)
-                    else:
-                        format_dict["fps"] = float(fps_str)
-                except (ValueError, ZeroDivisionError):
-                    pass
-
-            if bit_rate := video_stream.get("bit_rate"):
-                format_dict["vbr"] = int_or_none(bit_rate) / 1000 if isinstance(bit_rate, (int, str)) else None
-
-            if dar := str_or_none(video_stream.get("display_aspect_ratio")):
-                format_dict["aspect_ratio"] = dar
-
-        if audio_stream:
-            if codec_name := str_or_none(audio_stream.get("codec_name")):
-                format_dict["acodec"] = codec_name
-
-            if sample_rate := int_or_none(audio_stream.get("sample_rate")):
-                format_dict["asr"] = sample_rate
-
-            if channels := int_or_none(audio_stream.get("channels")):
-                format_dict["audio_channels"] = channels
-
-            if bit_rate := audio_stream.get("bit_rate"):
-                format_dict["abr"] = int_or_none(bit_rate) / 1000 if isinstance(bit_rate, (int, str)) else None
-
-        if not video_stream:
+            if (fps_str := video_stream.get("r_frame_rate")) and (fps := _parse_fps(fps_str)) is not None:
+                format_dict["fps"] = fps
+        else:
             format_dict["vcodec"] = "none"
 
-        if not audio_stream:
+        if audio_stream := streams_by_type.get("audio"):
+            _copy_fields(format_dict, audio_stream, self._AUDIO_FIELDS)
+        else:
             format_dict["acodec"] = "none"
 
         return format_dict
 
-    def _format_item(self, video_data: dict, _type: str, headers: dict | None = None, base_url: str | None = None) -> dict:
-        download_url = video_data.get("download_url")
-        if download_url and base_url and not download_url.startswith(("http://", "https://")):
-            download_url = f"{base_url}{download_url}"
+    def _format_item(self, video_data: dict, _type: str, headers: dict[str, str], base_url: str | None = None) -> dict:
+        ext = video_data.get("ext")
+        filesize = _fast_int(video_data.get("size_bytes"))
+        meta_data = video_data.get("meta_data") or {}
+
+        download_url = _abs_url(video_data.get("download_url"), base_url)
 
         base_format = {
             "url": download_url,
-            "ext": video_data.get("ext"),
-            "filesize": int_or_none(video_data.get("size_bytes")),
+            "ext": ext,
+            "filesize": filesize,
         }
 
-        meta_data = video_data.get("meta_data", {})
         if ffprobe_data := meta_data.get("ffprobe"):
             base_format = self._expand_format(base_format, ffprobe_data)
 
-        info_url = video_data.get("info_url")
-        if info_url and base_url and not info_url.startswith(("http://", "https://")):
-            info_url = f"{base_url}{info_url}"
+        info_url = _abs_url(video_data.get("info_url"), base_url)
 
         dct = {
             "id": video_data.get("public_id", video_data.get("id")),
             "_type": _type,
-            "ext": video_data.get("ext"),
+            "ext": ext,
             "mimetype": video_data.get("mimetype"),
             "url": info_url,
             "webpage_url": info_url,
             "formats": [base_format],
             "title": meta_data.get("title") or video_data.get("filename", f"file_{video_data['id']}"),
             "filename": video_data.get("filename"),
-            "filesize": int_or_none(video_data.get("size_bytes")),
-            "upload_date": str_or_none(self._parse_date(video_data.get("created_at"))),
-            **self._extract_metadata(meta_data, self._POSSIBLE_METADATA_FIELDS),
+            "filesize": filesize,
+            "upload_date": self._parse_date(video_data.get("created_at")),
+            "http_headers": headers,
         }
+        dct.update(self._extract_metadata(meta_data))
 
         if base_format.get("duration") and not dct.get("duration"):
             dct["duration"] = base_format["duration"]
 
-        if headers:
-            dct["http_headers"] = headers
-
         return dct